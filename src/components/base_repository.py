@@ -1,5 +1,6 @@
 import json
 import functools
+import inspect
 from typing import Generic, Type, List, Optional, Any, Dict, Set
 from uuid import UUID
 from psycopg import AsyncConnection
@@ -14,6 +15,14 @@ from src.core.models import DBModelMixin, T # Import the mixin and TypeVar
 
 def db_operation(func):
     """Decorator for database operations that handles common patterns."""
+    if inspect.isasyncgenfunction(func):
+        # Streaming operations yield rows, so they are wrapped as generators
+        @functools.wraps(func)
+        async def gen_wrapper(self, conn: AsyncConnection, *args, **kwargs):
+            async for item in func(self, conn, *args, **kwargs):
+                yield item
+        return gen_wrapper
+
     @functools.wraps(func)
     async def wrapper(self, conn: AsyncConnection, *args, **kwargs):
         try:
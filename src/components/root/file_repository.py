@@ -1,5 +1,6 @@
 from uuid import UUID
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
 from psycopg import AsyncConnection
 from psycopg.rows import class_row
 from psycopg.sql import SQL, Identifier
@@ -8,10 +9,39 @@ from src.core.models import RootFile, T
 from src.components.base_repository import BaseRepository, db_operation
 
 class RootFileRepository(BaseRepository[RootFile]):
+    # bulk_create switches from multi-row INSERT to COPY at this many rows;
+    # below it a single INSERT stays far under Postgres' 65535 bind parameters
+    copy_threshold = 500
+
+    _upsert_conflict_sql = SQL("""
+        ON CONFLICT (root_uri, path) DO UPDATE SET
+            name = EXCLUDED.name,
+            extension = EXCLUDED.extension,
+            mime_type = EXCLUDED.mime_type,
+            size = EXCLUDED.size,
+            atime = EXCLUDED.atime,
+            mtime = EXCLUDED.mtime,
+            ctime = EXCLUDED.ctime,
+            extra = EXCLUDED.extra
+    """)
+
     def __init__(self):
         super().__init__(RootFile)
         self.table_name = "root_files"
         self.pk_columns = ["root_uri", "path"] # Composite primary key
+        # Statements run on every sync; composed once and executed with
+        # prepare=True so pooled connections reuse the server-side plan
+        self._files_by_root_sql = SQL("""
+            SELECT * FROM {}
+            WHERE root_uri = %s
+            ORDER BY path
+        """).format(Identifier(self.table_name))
+        self._file_states_sql = SQL(
+            "SELECT path, size, mtime, mime_type FROM {} WHERE root_uri = %s"
+        ).format(Identifier(self.table_name))
+        self._delete_paths_sql = SQL(
+            "DELETE FROM {} WHERE root_uri = %s AND path = ANY(%s)"
+        ).format(Identifier(self.table_name))
 
     @db_operation
     async def get_by_pk(self, conn: AsyncConnection, root_uri: str, path: str) -> Optional[RootFile]:
@@ -28,16 +58,19 @@ class RootFileRepository(BaseRepository[RootFile]):
     @db_operation
     async def get_files_by_root(self, conn: AsyncConnection, root_uri: str) -> List[RootFile]:
         """Get all files for a root"""
-        query = SQL("""
-            SELECT * FROM {}
-            WHERE root_uri = %s
-            ORDER BY path
-        """).format(Identifier(self.table_name))
-
         async with conn.cursor(row_factory=class_row(RootFile)) as cur:
-            await cur.execute(query, (root_uri,))
+            await cur.execute(self._files_by_root_sql, (root_uri,), prepare=True)
             return await cur.fetchall()
 
+    @db_operation
+    async def stream_file_states(
+        self, conn: AsyncConnection, root_uri: str, batch_size: int = 5000
+    ) -> AsyncIterator[Tuple[str, Optional[int], Optional[datetime], Optional[str]]]:
+        """Stream (path, size, mtime, mime_type) for every file of a root, batch_size rows at a time"""
+        async with conn.cursor() as cur:
+            async for row in cur.stream(self._file_states_sql, (root_uri,), size=batch_size):
+                yield row
+
     @db_operation
     async def get_files_by_extension(self, conn: AsyncConnection, root_uri: str, extension: str) -> List[RootFile]:
         """Get all files with a specific extension in a root"""
@@ -78,48 +111,72 @@ class RootFileRepository(BaseRepository[RootFile]):
         """Create multiple RootFile instances at once."""
         if not files:
             return []
-        # Prepare data, excluding non-persisted fields
-        file_data_list = [f.model_dump_db() for f in files]
-        if not file_data_list:
-            return []
 
         # Get all persisted fields from the model class instead of just the first item
         columns = list(RootFile.get_persisted_fields())
         columns_sql = SQL(", ").join(map(Identifier, columns))
 
-        # Create placeholders for each file's values
-        values_placeholders = SQL(", ").join([SQL("%s")] * len(columns))
-        all_values_sql = SQL(", ").join([SQL("({})").format(values_placeholders)] * len(file_data_list))
+        # Read column values straight off the models as positional rows;
+        # model_dump() would serialise every field into an intermediate dict
+        # per file only for the values to be picked back out by column
+        rows = [tuple(getattr(f, col) for col in columns) for f in files]
 
-        # Flatten the list of values, using None for missing keys
-        flat_values = []
-        for file_data in file_data_list:
-            for col in columns:
-                flat_values.append(file_data.get(col))
+        if len(rows) >= self.copy_threshold:
+            return await self._bulk_upsert_via_copy(conn, columns, rows)
 
+        values_placeholders = SQL("({})").format(SQL(", ").join([SQL("%s")] * len(columns)))
         query = SQL("""
             INSERT INTO {} ({})
             VALUES {}
-            ON CONFLICT (root_uri, path) DO UPDATE SET
-                name = EXCLUDED.name,
-                extension = EXCLUDED.extension,
-                mime_type = EXCLUDED.mime_type,
-                size = EXCLUDED.size,
-                atime = EXCLUDED.atime,
-                mtime = EXCLUDED.mtime,
-                ctime = EXCLUDED.ctime,
-                extra = EXCLUDED.extra
+            {}
             RETURNING *
         """).format(
-            Identifier(self.table_name), columns_sql, all_values_sql
+            Identifier(self.table_name),
+            columns_sql,
+            SQL(", ").join([values_placeholders] * len(rows)),
+            self._upsert_conflict_sql,
         )
 
         async with conn.cursor(row_factory=class_row(RootFile)) as cur:
-            await cur.execute(query, flat_values)
+            # Flatten the rows into one parameter list
+            await cur.execute(query, [value for row in rows for value in row])
             # Fetchall might return results for both inserts and updates
             results = await cur.fetchall()
-            # Commit is handled by the db_operation decorator
-            return results
+        # Commit is handled by the db_operation decorator
+        return results
+
+    async def _bulk_upsert_via_copy(
+        self, conn: AsyncConnection, columns: List[str], rows: List[Tuple[Any, ...]]
+    ) -> List[RootFile]:
+        """Upsert rows by COPYing them into a session-local staging table first."""
+        staging = Identifier(f"{self.table_name}_staging")
+        columns_sql = SQL(", ").join(map(Identifier, columns))
+
+        # The staging table lives for the session and is emptied on commit;
+        # it is also truncated below so repeated batches in one transaction
+        # don't re-apply earlier rows
+        await conn.execute(SQL(
+            "CREATE TEMP TABLE IF NOT EXISTS {} (LIKE {} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        ).format(staging, Identifier(self.table_name)))
+
+        async with conn.cursor() as cur:
+            async with cur.copy(SQL("COPY {} ({}) FROM STDIN").format(staging, columns_sql)) as copy:
+                for row in rows:
+                    await copy.write_row(row)
+
+        query = SQL("""
+            INSERT INTO {} ({})
+            SELECT {} FROM {}
+            {}
+            RETURNING *
+        """).format(Identifier(self.table_name), columns_sql, columns_sql, staging, self._upsert_conflict_sql)
+
+        async with conn.cursor(row_factory=class_row(RootFile)) as cur:
+            await cur.execute(query)
+            results = await cur.fetchall()
+
+        await conn.execute(SQL("TRUNCATE {}").format(staging))
+        return results
 
     @db_operation
     async def delete(self, conn: AsyncConnection, root_uri: str, path: str) -> bool:
@@ -128,6 +185,15 @@ class RootFileRepository(BaseRepository[RootFile]):
             await cur.execute(query, (root_uri, path))
             return cur.rowcount > 0
 
+    @db_operation
+    async def delete_paths(self, conn: AsyncConnection, root_uri: str, paths: List[str]) -> int:
+        """Delete several files of a root in one statement, returning the number removed"""
+        if not paths:
+            return 0
+        async with conn.cursor() as cur:
+            await cur.execute(self._delete_paths_sql, (root_uri, paths), prepare=True)
+            return cur.rowcount
+
     async def get_by_id(self, conn: AsyncConnection, id: UUID | str) -> Optional[T]:
         raise NotImplementedError
 
@@ -15,15 +15,28 @@ class RootRepository(BaseRepository[Root]):
         self.table_name = "roots"
         self.identifier_field = "uri"
         self.pk_columns = ["uri"] # Explicitly define PK for clarity if needed by BaseRepository
+        # Looked up on every scan; composed once and prepared server-side
+        self._by_uri_sql = SQL("SELECT * FROM {} WHERE uri = %s").format(Identifier(self.table_name))
+        # The no-op DO UPDATE makes RETURNING yield the row on conflict too
+        self._get_or_create_sql = SQL("""
+            INSERT INTO {} (uri) VALUES (%s)
+            ON CONFLICT (uri) DO UPDATE SET uri = EXCLUDED.uri
+            RETURNING *
+        """).format(Identifier(self.table_name))
 
     @db_operation
     async def get_by_uri(self, conn: AsyncConnection, uri: str) -> Optional[Root]:
         """Get a root by its URI (Primary Key)"""
         # This method already exists and is correct
-        query = SQL("SELECT * FROM {} WHERE uri = %s").format(Identifier(self.table_name))
+        async with conn.cursor(row_factory=class_row(Root)) as cur:
+            await cur.execute(self._by_uri_sql, (uri,), prepare=True)
+            return await cur.fetchone()
 
+    @db_operation
+    async def get_or_create(self, conn: AsyncConnection, uri: str) -> Root:
+        """Get a root by its URI, creating it first if needed, in a single round-trip"""
         async with conn.cursor(row_factory=class_row(Root)) as cur:
-            await cur.execute(query, (uri,))
+            await cur.execute(self._get_or_create_sql, (uri,), prepare=True)
             return await cur.fetchone()
 
     @db_operation
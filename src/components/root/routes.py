@@ -43,7 +43,7 @@ async def _render_management_page(db: AsyncConnection, user_state_service: UserS
     """Helper function to fetch data and render the management page."""
 
     roots = await root_repository.get_all(db)
-    selected_roots = user_state_service.get('selected_roots', default=[])
+    selected_roots = await user_state_service.get('selected_roots', default=[])
     return {
         'roots': roots,
         'selected_roots': selected_roots
@@ -60,12 +60,12 @@ async def select_root(root_select: RootSelectRequest,
     selected_root_obj = await root_repository.get_by_uri(db, root_select.root_uri)
 
     # Get the current list of selected roots
-    current_selected_roots = user_state_service.get('selected_roots', default=[])
+    current_selected_roots = await user_state_service.get('selected_roots', default=[])
 
     if selected_root_obj:
         if selected_root_obj.uri not in current_selected_roots:
             current_selected_roots.append(selected_root_obj.uri)
-            user_state_service.set('selected_roots', current_selected_roots)
+            await user_state_service.set('selected_roots', current_selected_roots)
 
     return await _render_management_page(db, user_state_service)
 
@@ -79,12 +79,12 @@ async def deselect_root(root_deselect: RootSelectRequest,
     """Deselect a root from the current working set."""
 
     # Get the current list of selected roots
-    current_selected_roots = user_state_service.get('selected_roots', default=[])
+    current_selected_roots = await user_state_service.get('selected_roots', default=[])
 
     # Remove the root if it exists in the list
     if root_deselect.root_uri in current_selected_roots:
         current_selected_roots.remove(root_deselect.root_uri)
-        user_state_service.set('selected_roots', current_selected_roots)
+        await user_state_service.set('selected_roots', current_selected_roots)
 
     return await _render_management_page(db, user_state_service)
 
@@ -129,7 +129,7 @@ async def root_selector_component(
 
     root_repo = RootRepository()
     roots = await root_repo.get_all(db)
-    selected_roots = user_state_service.get('selected_roots', default=[])
+    selected_roots = await user_state_service.get('selected_roots', default=[])
 
     return {
         'roots': roots,
@@ -1,46 +1,103 @@
+import asyncio
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
 from psycopg import AsyncConnection
-import aiofiles
-import aiofiles.os
 
 from src.core.models import Root, RootFile
 from src.utils.file_types import get_mime_type
 from src.components.repositories import root_repository, root_file_repository
 from src.logging import logger
 
+# MIME types recorded for entries that are not regular files
+_SPECIAL_KINDS = ("inode/directory", "inode/symlink")
+
+
+def _entry_kind(entry: os.DirEntry) -> Optional[str]:
+    """Return the special MIME type for a directory or symlink entry, or None for a regular file."""
+    if entry.is_symlink():
+        return "inode/symlink"
+    if entry.is_dir(follow_symlinks=False):
+        return "inode/directory"
+    return None
+
+
 class FileScanner:
 
-    def __init__(self, conn: AsyncConnection):
+    # Shared across scanner instances; stat and libmagic calls block, so they
+    # run here instead of on the event loop
+    _io_pool: Optional[ThreadPoolExecutor] = None
+    _io_pool_workers = 32
+    # Entries scanned and upserted per batch during sync
+    upsert_batch_size = 1024
+    # Unreadable directories logged individually per errno in one walk; the
+    # rest are only counted, so a permission-denied subtree can't flood the log
+    max_logged_errors_per_errno = 5
+
+    def __init__(self, conn: AsyncConnection, prefetch_depth: int = 64):
         self.conn = conn
         self.root_repo = root_repository
         self.root_file_repo = root_file_repository
+        # Upper bound on entries queued to the I/O pool at once
+        self.prefetch_depth = prefetch_depth
+
+    @classmethod
+    def _get_io_pool(cls) -> ThreadPoolExecutor:
+        if cls._io_pool is None:
+            cls._io_pool = ThreadPoolExecutor(max_workers=cls._io_pool_workers, thread_name_prefix="file-scanner")
+        return cls._io_pool
+
+    async def _run_batched(self, func, *arg_lists) -> list:
+        """
+        Run a blocking function over a batch of arguments in the I/O pool.
+
+        Args:
+            func: Synchronous callable to run per item
+            *arg_lists: Parallel argument lists, one per positional parameter
 
-    async def _scan_entry(self, root_uri: str, entry_path: Path) -> Optional[RootFile]:
-        """Scan a file or directory and create a RootFile Pydantic model."""
+        Returns:
+            Results in input order; exceptions are returned in place of results
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._get_io_pool()
+        semaphore = asyncio.Semaphore(self.prefetch_depth)
+
+        async def _run(*args):
+            async with semaphore:
+                return await loop.run_in_executor(pool, func, *args)
+
+        return await asyncio.gather(*(_run(*args) for args in zip(*arg_lists)), return_exceptions=True)
+
+    def _scan_entry_sync(self, root_uri: str, relative_path: str, entry: os.DirEntry) -> Optional[RootFile]:
+        """Scan a file or directory and create a RootFile Pydantic model (blocking)."""
         try:
-            stat = await aiofiles.os.stat(entry_path)
-            is_dir = await aiofiles.os.path.isdir(entry_path)
-            # Ensure root_uri is a Path object for relative_to
-            root_path_obj = Path(root_uri)
-            relative_path = entry_path.relative_to(root_path_obj)
-
-            if is_dir:
-                mime_type = "inode/directory"
+            # DirEntry caches the lstat result, so the collect pass and this
+            # scan share a single stat per entry
+            stat = entry.stat(follow_symlinks=False)
+            kind = _entry_kind(entry)
+
+            if kind is not None:
+                # Directories and symlinks are recorded by kind only
+                mime_type = kind
                 extension = None
                 size = 0
             else:
-                # Use our improved MIME type detection
-                mime_type = get_mime_type(str(entry_path))
-                extension = entry_path.suffix
+                # Use our improved MIME type detection; the entry is known
+                # not to be a directory, so skip the isdir() stat
+                mime_type = get_mime_type(entry.path, is_dir=False)
+                extension = os.path.splitext(entry.name)[1]
                 size = stat.st_size
 
-            root_file = RootFile(
+            # Values come straight from stat()/DirEntry with the right types,
+            # so skip pydantic validation on this per-file path
+            root_file = RootFile.model_construct(
                 root_uri=root_uri,
-                name=entry_path.name,
-                path=str(relative_path),
+                name=entry.name,
+                path=relative_path,
                 extension=extension,
                 mime_type=mime_type,
                 size=size,
@@ -50,155 +107,206 @@ class FileScanner:
             )
             return root_file
         except FileNotFoundError:
-            logger.warning(f"Entry not found during scan: {entry_path}")
+            logger.warning("Entry not found during scan: {}", entry.path)
             return None
         except Exception as e:
-            logger.error(f"Error scanning entry {entry_path}: {e}", exc_info=True)
+            logger.exception("Error scanning entry {}: {}", entry.path, e)
             return None
 
-    async def _get_existing_files(self, root_uri: str) -> Dict[str, RootFile]:
-        """Get all existing files for a root from the database using the repository."""
-        files = await self.root_file_repo.get_files_by_root(self.conn, root_uri)
-        return {file.path: file for file in files}
+    @staticmethod
+    def _entry_changed(size: Optional[int], mtime: Optional[datetime], mime_type: Optional[str], entry: os.DirEntry) -> bool:
+        """Check whether an entry on disk differs from its stored size, mtime and MIME type."""
+        # Served from the DirEntry cache primed by _list_directory_sync
+        stat = entry.stat(follow_symlinks=False)
+        kind = _entry_kind(entry)
+
+        # Cheap integer/flag checks first: a kind change (e.g. file became
+        # dir or symlink) or a size change on a regular file
+        if kind != (mime_type if mime_type in _SPECIAL_KINDS else None):
+            return True
+        if kind is None and stat.st_size != size:
+            return True
+        # Only then build a datetime to compare against the stored mtime
+        return datetime.fromtimestamp(stat.st_mtime) != mtime
+
+    @staticmethod
+    def _list_directory_sync(directory: str) -> List[os.DirEntry]:
+        """
+        List a directory and stat its entries (blocking).
+
+        Entries are lstat'ed, so symlinks are recorded as links rather than
+        followed. Stat results are cached on each DirEntry, so the change
+        check and the scan that follow need no further syscalls.
+
+        Args:
+            directory: Absolute path of the directory to list
 
-    async def _collect_filesystem_files(self, root: Root) -> Dict[str, Path]:
-        """Collect all files and directories in the filesystem for a root."""
-        # Ensure root.uri is a Path object
-        root_path = Path(root.uri)
+        Returns:
+            Entries that could be stat'ed; ones that vanished in the meantime
+            are left out, so sync treats them as removed
+        """
+        listed = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    entry.stat(follow_symlinks=False)
+                    entry.is_symlink()
+                except OSError:
+                    continue
+                listed.append(entry)
+        return listed
+
+    async def _collect_filesystem_files(self, root: Root) -> Dict[str, os.DirEntry]:
+        """Collect all files and directories in the filesystem for a root, keyed by relative path."""
+        # Entries under the root all start with this prefix, so relative
+        # paths are a slice of entry.path rather than a Path.relative_to()
+        prefix_len = len(os.path.join(root.uri, ""))
         filesystem_entries = {}
 
-        async def _collect_entries_recursive(directory: Path):
-            try:
-                entries = await aiofiles.os.scandir(directory)
-                for entry in entries:
-                    entry_path = Path(entry.path)
-                    relative_path = entry_path.relative_to(root_path)
-                    filesystem_entries[str(relative_path)] = entry_path # Add both files and dirs
-
-                    if entry.is_dir():
-                        # Ensure recursive call uses the internal helper name
-                        await _collect_entries_recursive(entry_path) # Recurse into subdirectories
-            except Exception as e:
-                logger.error(f"Error collecting files from {directory}: {e}", exc_info=True)
-
-        # Initial call to the recursive helper
-        await _collect_entries_recursive(root_path)
+        # Walk level by level; all directories found at one depth are listed
+        # concurrently in the I/O pool, which hides per-directory latency on
+        # network filesystems
+        pending = [root.uri]
+        listing_errors = Counter()
+        while pending:
+            listings = await self._run_batched(self._list_directory_sync, pending)
+            next_pending = []
+            for directory, listing in zip(pending, listings):
+                if isinstance(listing, OSError):
+                    listing_errors[listing.errno] += 1
+                    if listing_errors[listing.errno] <= self.max_logged_errors_per_errno:
+                        logger.warning("Skipping unreadable directory {}: {}", directory, listing)
+                    continue
+                if isinstance(listing, Exception):
+                    logger.opt(exception=listing).error("Error collecting files from {}: {}", directory, listing)
+                    continue
+                for entry in listing:
+                    filesystem_entries[entry.path[prefix_len:]] = entry # Add both files and dirs
+                    # Never descend through symlinks; a link to an ancestor
+                    # would otherwise make the walk loop forever
+                    if entry.is_dir(follow_symlinks=False):
+                        next_pending.append(entry.path)
+            pending = next_pending
+
+        skipped = sum(listing_errors.values())
+        if skipped:
+            logger.warning(
+                "Skipped {} unreadable directories under {} (errno counts: {})",
+                skipped, root.uri, dict(listing_errors),
+            )
+
         return filesystem_entries
 
     async def _delete_removed_files(self, root_uri: str, paths_to_delete: List[str]) -> int: # Renaming might be good later
         """Delete entries (files or directories) using the repository."""
-        deleted_count = 0
         if not paths_to_delete:
             return 0
-        for path in paths_to_delete:
-            try:
-                deleted = await self.root_file_repo.delete(self.conn, root_uri, path)
-                if deleted:
-                    deleted_count += 1
-            except Exception as e:
-                logger.error(f"Error deleting entry {path} for root {root_uri}: {e}", exc_info=True)
-        return deleted_count
+        try:
+            return await self.root_file_repo.delete_paths(self.conn, root_uri, paths_to_delete)
+        except Exception as e:
+            logger.exception("Error deleting {} entries for root {}: {}", len(paths_to_delete), root_uri, e)
+            return 0
 
     async def sync_directory(self, root: Root) -> None:
         """
         Synchronize the database with the current state of the filesystem for a given root.
         Uses bulk operations for efficiency.
         """
-        logger.info(f"Starting sync for root: {root.uri}")
+        logger.info("Starting sync for root: {}", root.uri)
         added_count = 0
         updated_count = 0
         deleted_count = 0
-        files_to_upsert: List[RootFile] = []
 
         try:
-            # Get existing files from database via repository
-            existing_files = await self._get_existing_files(root.uri)
-            logger.debug(f"Found {len(existing_files)} existing entries in DB for {root.uri}")
-
             # Get current files and directories from filesystem
             filesystem_entries = await self._collect_filesystem_files(root) # Method name kept for now
-            logger.debug(f"Found {len(filesystem_entries)} entries (files/dirs) on disk for {root.uri}")
-
-            # Find entries to update, add, or remove
-            existing_paths = set(existing_files.keys())
-            filesystem_paths = set(filesystem_entries.keys())
-
-            paths_to_update = existing_paths.intersection(filesystem_paths)
-            paths_to_add = filesystem_paths - existing_paths
-            paths_to_delete = list(existing_paths - filesystem_paths) # Convert set to list
-
-            logger.debug(f"Entries to add: {len(paths_to_add)}")
-            logger.debug(f"Entries to update/check: {len(paths_to_update)}")
-            logger.debug(f"Entries to delete: {len(paths_to_delete)}")
-
-            # Process entries to add
-            for path_str in paths_to_add:
-                entry_path = filesystem_entries[path_str]
-                scanned_entry = await self._scan_entry(root.uri, entry_path)
-                if scanned_entry:
-                    files_to_upsert.append(scanned_entry)
-                    added_count += 1 # Tentative count
-
-            # Process entries to update
-            for path_str in paths_to_update:
-                existing_entry = existing_files[path_str]
-                entry_path = filesystem_entries[path_str]
-                try:
-                    stat = await aiofiles.os.stat(entry_path)
-                    is_dir = await aiofiles.os.path.isdir(entry_path) # Check if it's a directory
-
-                    needs_update = False
-                    # Check if entry changed based on mtime (always)
-                    if datetime.fromtimestamp(stat.st_mtime) != existing_entry.mtime:
-                        needs_update = True
-                    # Additionally check size for files
-                    elif not is_dir and stat.st_size != existing_entry.size:
-                         needs_update = True
-                    # Additionally check mime_type change (e.g., file became dir or vice-versa)
-                    elif existing_entry.mime_type == "inode/directory" and not is_dir:
-                         needs_update = True
-                    elif existing_entry.mime_type != "inode/directory" and is_dir:
-                         needs_update = True
-
-
-                    if needs_update:
-                        scanned_entry = await self._scan_entry(root.uri, entry_path)
-                        if scanned_entry:
-                            files_to_upsert.append(scanned_entry)
-                            updated_count += 1 # Tentative count
-                except FileNotFoundError:
-                    logger.warning(f"Entry {entry_path} found in DB but not on disk during update check. Will be deleted.")
-                    # If entry disappeared between listing and stat, it will be handled by delete
-                    if path_str not in paths_to_delete:
-                         paths_to_delete.append(path_str)
-                except Exception as e:
-                    logger.error(f"Error checking entry for update {entry_path}: {e}", exc_info=True)
-
-
+            logger.debug("Found {} entries (files/dirs) on disk for {}", len(filesystem_entries), root.uri)
+
+            # Stream the stored entries and classify each row as it arrives;
+            # stats were taken while listing, so no further I/O is needed
+            paths_to_add = set(filesystem_entries) # Narrowed to unmatched paths below
+            paths_to_rescan: List[str] = []
+            paths_to_delete: List[str] = []
+            existing_count = 0
+            async for path_str, size, mtime, mime_type in self.root_file_repo.stream_file_states(self.conn, root.uri):
+                existing_count += 1
+                entry = filesystem_entries.get(path_str)
+                if entry is None:
+                    paths_to_delete.append(path_str)
+                    continue
+                paths_to_add.discard(path_str)
+                if self._entry_changed(size, mtime, mime_type, entry):
+                    paths_to_rescan.append(path_str)
+
+            logger.debug("Found {} existing entries in DB for {}", existing_count, root.uri)
+            logger.debug("Entries to add: {}", len(paths_to_add))
+            logger.debug("Entries to update: {}", len(paths_to_rescan))
+            logger.debug("Entries to delete: {}", len(paths_to_delete))
+
+            # Scan new and changed entries in the I/O pool and upsert them a
+            # batch at a time, so only one batch of models is held in memory.
+            # The next batch is scanned while the current one is written.
+            scan_paths = list(paths_to_add) + paths_to_rescan
+            batches = [
+                scan_paths[start:start + self.upsert_batch_size]
+                for start in range(0, len(scan_paths), self.upsert_batch_size)
+            ]
+
+            def _scan_batch(batch_paths: List[str]) -> asyncio.Future:
+                return asyncio.ensure_future(self._run_batched(
+                    self._scan_entry_sync,
+                    [root.uri] * len(batch_paths),
+                    batch_paths,
+                    [filesystem_entries[p] for p in batch_paths],
+                ))
+
+            next_scan = None
             async with self.conn.transaction():
-                # Bulk insert/update changed/new files
-                if files_to_upsert:
-                    logger.info(f"Upserting {len(files_to_upsert)} files for root {root.uri}")
-                    # bulk_create handles ON CONFLICT DO UPDATE
-                    results = await self.root_file_repo.bulk_create(self.conn, files_to_upsert)
-                    # Note: bulk_create returns the upserted models. We could refine counts here if needed.
-                    logger.debug(f"Upsert result count: {len(results)}")
-
+                try:
+                    # Started only once the transaction is open, so the
+                    # finally below always gets the chance to cancel it
+                    next_scan = _scan_batch(batches[0]) if batches else None
+                    for index, batch_paths in enumerate(batches):
+                        scanned = await next_scan
+                        next_scan = _scan_batch(batches[index + 1]) if index + 1 < len(batches) else None
+
+                        files_to_upsert = []
+                        for path_str, scanned_entry in zip(batch_paths, scanned):
+                            if isinstance(scanned_entry, RootFile):
+                                files_to_upsert.append(scanned_entry)
+                                # Tentative counts
+                                if path_str in paths_to_add:
+                                    added_count += 1
+                                else:
+                                    updated_count += 1
+
+                        # Bulk insert/update changed/new files
+                        if files_to_upsert:
+                            logger.debug("Upserting {} files for root {}", len(files_to_upsert), root.uri)
+                            # bulk_create handles ON CONFLICT DO UPDATE
+                            results = await self.root_file_repo.bulk_create(self.conn, files_to_upsert)
+                            # Note: bulk_create returns the upserted models. We could refine counts here if needed.
+                            logger.debug("Upsert result count: {}", len(results))
+                finally:
+                    # Don't leave a prefetched scan running if an upsert failed
+                    if next_scan is not None:
+                        next_scan.cancel()
 
                 # Delete removed entries
                 if paths_to_delete:
-                    logger.info(f"Deleting {len(paths_to_delete)} entries for root {root.uri}")
+                    logger.info("Deleting {} entries for root {}", len(paths_to_delete), root.uri)
                     deleted_count = await self._delete_removed_files(root.uri, paths_to_delete) # Removed self.conn argument
 
 
             # Final logging outside transaction
-            logger.info(f"Sync completed for {root.uri}:")
             # Note: Counts are based on intent before bulk operations. Actual DB changes might differ slightly on conflict/error.
-            logger.info(f"  - Added/Updated: {len(files_to_upsert)} (approx {added_count} added, {updated_count} updated)")
-            logger.info(f"  - Deleted: {deleted_count}")
+            logger.info(
+                "Sync completed for {}: added/updated={} (approx {} added, {} updated) deleted={}",
+                root.uri, added_count + updated_count, added_count, updated_count, deleted_count,
+            )
 
         except Exception as e:
-            logger.error(f"Error synchronizing directory {root.uri}: {e}", exc_info=True)
+            logger.exception("Error synchronizing directory {}: {}", root.uri, e)
             # Ensure transaction is rolled back if error occurs before commit
             # (Handled by async context manager and db_operation decorator)
 
@@ -218,22 +326,15 @@ class FileScanner:
         if not path_obj.is_dir():
             raise ValueError(f"'{directory_path}' is not a valid directory.")
 
-        # Check/Create Root using repository
-         # Wrap repository calls potentially needing transaction in one block
+        # Get or create the Root in one upsert round-trip
         async with self.conn.transaction():
-            root = await self.root_repo.get_by_uri(self.conn, path_str)
-            if root is None:
-                logger.info(f"Root not found for {path_str}, creating new one.")
-                new_root_model = Root(uri=path_str) # Let DB handle created_at/updated_at
-                root = await self.root_repo.create(self.conn, new_root_model)
-                logger.info(f"Root created: {root.uri}")
-            else:
-                logger.info(f"Found existing root: {root.uri}")
+            root = await self.root_repo.get_or_create(self.conn, path_str)
 
         if root is None:
              # This should not happen if DB/repo logic is correct, but defensively check
-             logger.error(f"Failed to get or create root for {path_str}")
+             logger.error("Failed to get or create root for {}", path_str)
              return
+        logger.info("Using root: {}", root.uri)
 
         # Perform the sync operation (outside the root creation transaction)
         # sync_directory now handles add/update/delete based on comparison
@@ -1,11 +1,11 @@
 import json
-import redis
-from typing import Any, Optional
+import redis.asyncio as redis
+from typing import Any, Dict, Optional
 from src.logging import logger
 
 
 class RedisService:
-    """Service for Redis caching operations"""
+    """Service for async Redis caching operations"""
 
     def __init__(self, redis_url: str = None):
         """Initialize Redis service
@@ -16,7 +16,7 @@ class RedisService:
         self.redis = redis.Redis.from_url(redis_url, decode_responses=True)
         self.default_ttl = 3600  # Default TTL: 1 hour
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """Set a value in Redis with optional TTL
 
         Args:
@@ -25,7 +25,7 @@ class RedisService:
             ttl: Time to live in seconds, uses default_ttl if None
         """
         try:
-            self.redis.setex(
+            await self.redis.setex(
                 key,
                 ttl or self.default_ttl,
                 json.dumps(value)
@@ -33,7 +33,7 @@ class RedisService:
         except Exception as e:
             logger.error(f"Error setting Redis key {key}: {e}")
 
-    def get(self, key: str) -> Optional[Any]:
+    async def get(self, key: str) -> Optional[Any]:
         """Get a value from Redis
 
         Args:
@@ -43,13 +43,17 @@ class RedisService:
             Deserialized value if found, None otherwise
         """
         try:
-            value = self.redis.get(key)
+            value = await self.redis.get(key)
             if value:
                 return json.loads(value)
         except Exception as e:
             logger.error(f"Error getting Redis key {key}: {e}")
         return None
 
+    async def close(self) -> None:
+        """Close the underlying connection pool"""
+        await self.redis.aclose()
+
     def set_default_ttl(self, ttl_seconds: int) -> None:
         """Set the default TTL (Time To Live) in seconds
 
@@ -57,3 +61,72 @@ class RedisService:
             ttl_seconds: TTL in seconds
         """
         self.default_ttl = ttl_seconds
+
+    async def hget(self, key: str, field: str) -> Optional[Any]:
+        """Get a single field from a Redis hash
+
+        Args:
+            key: Redis key of the hash
+            field: Field name
+
+        Returns:
+            Deserialized field value if found, None otherwise
+        """
+        try:
+            value = await self.redis.hget(key, field)
+            if value is not None:
+                return json.loads(value)
+        except Exception as e:
+            logger.error(f"Error getting field {field} of Redis hash {key}: {e}")
+        return None
+
+    async def hgetall(self, key: str) -> Dict[str, Any]:
+        """Get all fields of a Redis hash
+
+        Args:
+            key: Redis key of the hash
+
+        Returns:
+            Mapping of field names to deserialized values, empty if the hash does not exist
+        """
+        try:
+            return {field: json.loads(value) for field, value in (await self.redis.hgetall(key)).items()}
+        except Exception as e:
+            logger.error(f"Error getting Redis hash {key}: {e}")
+        return {}
+
+    async def hset(self, key: str, field: str, value: Any) -> None:
+        """Set a single field of a Redis hash, without a TTL
+
+        Args:
+            key: Redis key of the hash
+            field: Field name
+            value: Value to store (will be JSON serialized)
+        """
+        try:
+            await self.redis.hset(key, field, json.dumps(value))
+        except Exception as e:
+            logger.error(f"Error setting field {field} of Redis hash {key}: {e}")
+
+    async def hdel(self, key: str, *fields: str) -> None:
+        """Delete fields from a Redis hash
+
+        Args:
+            key: Redis key of the hash
+            *fields: Field names to delete
+        """
+        try:
+            await self.redis.hdel(key, *fields)
+        except Exception as e:
+            logger.error(f"Error deleting fields from Redis hash {key}: {e}")
+
+    async def delete(self, key: str) -> None:
+        """Delete a key from Redis
+
+        Args:
+            key: Redis key
+        """
+        try:
+            await self.redis.delete(key)
+        except Exception as e:
+            logger.error(f"Error deleting Redis key {key}: {e}")
@@ -1,3 +1,4 @@
+import copy
 import inspect
 import os
 import yaml
@@ -16,6 +17,48 @@ from src.core.config_types import DialogTemplate, QuickieTemplate
 from src.logging import logger
 
 
+# libyaml-backed loader when PyYAML was built with it, with the same semantics as safe_load
+YamlSafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_yaml(stream: Any) -> Any:
+    """
+    Parse a YAML document using the fastest available safe loader.
+
+    Args:
+        stream: A string, bytes, or open file containing the YAML document. Passing a
+            file opened in binary mode lets libyaml detect the encoding and decode it in C.
+
+    Returns:
+        The parsed document
+    """
+    return yaml.load(stream, Loader=YamlSafeLoader)
+
+
+def yaml_has_top_level_key(file_path: Union[str, Path], key: str) -> bool:
+    """
+    Check whether a block-style YAML file declares a top-level key, without parsing it.
+
+    Lines are read until the key is found, so files that do not contain it
+    are rejected without building the document.
+
+    Args:
+        file_path: Path to the YAML file
+        key: The top-level mapping key to look for
+
+    Returns:
+        True if a line starts with the key; False if it doesn't or the file
+        can't be read, so one bad file doesn't stop a directory load
+    """
+    prefixes = (f"{key}:", f"'{key}':", f'"{key}":')
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return any(line.startswith(prefixes) for line in f)
+    except (OSError, UnicodeDecodeError) as e:
+        logger.error(f"Error reading {file_path}: {str(e)}")
+        return False
+
+
 def register_schema(alias: str = ""):
     """
     Decorator to register a Pydantic model as a schema.
@@ -43,6 +86,12 @@ class SchemaLoader:
     Loads Pydantic models from specified modules and registers them as schemas in the Registry.
     """
 
+    # Schema-bearing classes per module, keyed by (module name, module identity, scan_all);
+    # the identity changes when a module is reloaded
+    _module_cache: Dict[tuple[str, int, bool], List[tuple[Type[BaseModel], str]]] = {}
+    # Generated JSON schema and cleaned docstring per model class
+    _model_cache: Dict[Type[BaseModel], tuple[dict, str]] = {}
+
     def __init__(self, registry: Registry):
         """
         Initialize the schema loader with a registry.
@@ -68,17 +117,62 @@ class SchemaLoader:
         Returns:
             List of registered schemas
         """
+        schemas = self.collect_from_module(module_name, scan_all)
+        self.registry.add_schemas(schemas)
+        return schemas
+
+    def collect_from_module(self, module_name: str, scan_all: bool = False) -> List[Schema]:
+        """
+        Import a module and build schemas for its models without registering them.
+
+        Safe to call from worker threads, since the registry is not touched.
+
+        Args:
+            module_name: The name of the module to load schemas from
+            scan_all: If True, scan all BaseModel subclasses, otherwise only decorated ones
+
+        Returns:
+            List of schemas found in the module
+        """
         try:
             module = importlib.import_module(module_name)
         except ImportError:
             logger.error(f"Failed to import module: {module_name}")
             return []
 
+        cache_key = (module_name, id(module), scan_all)
+        candidates = self._module_cache.get(cache_key)
+        if candidates is None:
+            candidates = self._module_cache[cache_key] = self._find_schema_classes(module, module_name, scan_all)
+
         schemas = []
+        for obj, custom_alias in candidates:
+            schema = self._create_schema_from_model(obj, custom_alias)
+            if schema:
+                schemas.append(schema)
+
+        logger.info(f"Loaded {len(schemas)} schemas from module {module_name}")
+        return schemas
+
+    @staticmethod
+    def _find_schema_classes(module, module_name: str, scan_all: bool) -> List[tuple[Type[BaseModel], str]]:
+        """
+        Find the classes in a module that should be registered as schemas.
+
+        Args:
+            module: The imported module
+            module_name: The module's name, used to skip classes imported from elsewhere
+            scan_all: If True, include all BaseModel subclasses, otherwise only decorated ones
+
+        Returns:
+            (model class, custom alias) pairs in name order
+        """
+        candidates = []
 
-        # Find all classes in the module
-        for name, obj in inspect.getmembers(module):
-            if not inspect.isclass(obj) or obj.__module__ != module_name:
+        # Find all classes in the module; vars() avoids the getattr() that
+        # inspect.getmembers() performs on every attribute
+        for name, obj in sorted(vars(module).items()):
+            if not isinstance(obj, type) or obj.__module__ != module_name:
                 continue
 
             # Check if class is decorated with register_schema
@@ -93,13 +187,9 @@ class SchemaLoader:
                 if is_decorated and hasattr(obj, "__schema_alias__"):
                     custom_alias = getattr(obj, "__schema_alias__", "")
 
-                schema = self._create_schema_from_model(obj, custom_alias)
-                if schema:
-                    self.registry.add_schema(schema)
-                    schemas.append(schema)
+                candidates.append((obj, custom_alias))
 
-        logger.info(f"Loaded {len(schemas)} schemas from module {module_name}")
-        return schemas
+        return candidates
 
     def load_from_modules(self, module_names: List[str], scan_all: bool = False) -> List[Schema]:
         """
@@ -131,20 +221,34 @@ class SchemaLoader:
             A Schema object or None if conversion fails
         """
         try:
-            # Get the model's JSON schema
-            json_schema = model_class.model_json_schema()
-
-            # Use docstring
-            description = inspect.getdoc(model_class) or ""
-
-            # remove pydantic class description, if exists
-            if 'A base class for creating Pydantic models.' in description:
-                description = ""
-
-            # Create and return the Schema
+            cached = self._model_cache.get(model_class)
+            if cached is None:
+                # Models with unresolved forward references can't produce a
+                # schema; retry resolving them once and skip them quietly
+                # instead of failing inside model_json_schema()
+                if not getattr(model_class, '__pydantic_complete__', True) and \
+                        not model_class.model_rebuild(raise_errors=False):
+                    logger.warning(f"Skipping schema {model_class.__name__}: model has unresolved forward references")
+                    return None
+
+                # Get the model's JSON schema
+                json_schema = model_class.model_json_schema()
+
+                # Use docstring
+                description = inspect.getdoc(model_class) or ""
+
+                # remove pydantic class description, if exists
+                if 'A base class for creating Pydantic models.' in description:
+                    description = ""
+
+                cached = self._model_cache[model_class] = (json_schema, description)
+            json_schema, description = cached
+
+            # Create and return the Schema; each registry gets its own copy
+            # of the cached JSON schema
             return Schema(
                 name=custom_alias or model_class.__name__,
-                json_schema=json_schema,
+                json_schema=copy.deepcopy(json_schema),
                 description=description,
                 source_class=f"{model_class.__module__}.{model_class.__name__}"
             )
@@ -272,6 +376,9 @@ class DialogTemplateLoader:
     Loads dialog templates from YAML files and hydrates DialogTemplate Pydantic models.
     """
 
+    # Templates loaded per file, keyed by path and tagged with the file's (mtime_ns, size)
+    _file_cache: Dict[str, tuple[tuple[int, int], Dict[str, DialogTemplate]]] = {}
+
     def __init__(self, registry: Registry):
         """
         Initialize the dialog template loader with a registry.
@@ -332,8 +439,8 @@ class DialogTemplateLoader:
 
         try:
             # Load the YAML file
-            with open(file_path, 'r') as f:
-                yaml_content = yaml.safe_load(f)
+            with open(file_path, 'rb') as f:
+                yaml_content = load_yaml(f)
 
             if not yaml_content or 'dialog_templates' not in yaml_content:
                 logger.warning(f"No dialog_templates found in {file_path}")
@@ -386,14 +493,32 @@ class DialogTemplateLoader:
         logger.info(f"Loading dialog templates from directory: {directory}")
 
         all_templates = {}
-        yaml_extensions = ['.yaml', '.yml']
+        yaml_extensions = ('.yaml', '.yml')
+        seen_paths = set()
+
+        # Scan for all YAML files in the directory, only parsing those that declare dialog
+        # templates and reusing earlier results for files whose stat signature is unchanged
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith(yaml_extensions) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+                seen_paths.add(entry.path)
 
-        # Scan for all YAML files in the directory
-        for file_path in directory.iterdir():
-            if file_path.suffix.lower() in yaml_extensions:
-                templates = self.load_from_file(file_path)
+                cached = self._file_cache.get(entry.path)
+                if cached and cached[0] == signature:
+                    templates = cached[1]
+                else:
+                    templates = self.load_from_file(entry.path) if yaml_has_top_level_key(entry.path, 'dialog_templates') else {}
+                    self._file_cache[entry.path] = (signature, templates)
                 all_templates.update(templates)
 
+        # Evict files that have been removed from this directory
+        directory_str = os.fspath(directory)
+        for path in [path for path in self._file_cache if os.path.dirname(path) == directory_str and path not in seen_paths]:
+            del self._file_cache[path]
+
         logger.info(f"Loaded a total of {len(all_templates)} dialog templates from directory {directory}")
         return all_templates
 
@@ -485,8 +610,8 @@ class QuickieTemplateLoader:
         logger.info(f"Loading quickie templates from file: {file_path}")
 
         try:
-            with open(file_path, 'r') as f:
-                yaml_content = yaml.safe_load(f)
+            with open(file_path, 'rb') as f:
+                yaml_content = load_yaml(f)
 
             if not yaml_content or 'quickie_templates' not in yaml_content:
                 logger.warning(f"No 'quickie_templates' key found in {file_path}")
@@ -542,7 +667,7 @@ class QuickieTemplateLoader:
         yaml_extensions = ['.yaml', '.yml']
 
         for file_path in directory.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in yaml_extensions:
+            if file_path.is_file() and file_path.suffix.lower() in yaml_extensions and yaml_has_top_level_key(file_path, 'quickie_templates'):
                 templates = self.load_from_file(file_path)
                 all_templates.update(templates)
 
@@ -4,7 +4,7 @@ from typing import Optional, List, Dict, Any, TypeVar, ClassVar, Set
 from enum import Enum
 from dataclasses import dataclass
 
-from pydantic import BaseModel, Field, model_validator, ConfigDict
+from pydantic import BaseModel, Field, PrivateAttr, model_validator, ConfigDict
 from transitions.extensions import AsyncGraphMachine
 
 from src.core.config_types import DialogTemplate, Step
@@ -137,6 +137,8 @@ class Dialog(BaseModel, DBModelMixin):
 
     # Instance variables - not persisted
     machine: Optional[AsyncGraphMachine] = Field(exclude=True, default=None)
+    # (machine, {state: WorkflowStep}) derived from the machine above; rebuilt when it is replaced
+    _workflow_steps_by_state: Optional[tuple] = PrivateAttr(default=None)
 
     model_config = ConfigDict(
         extra='allow',
@@ -176,11 +178,13 @@ class Dialog(BaseModel, DBModelMixin):
         return steps
 
     def get_current_workflow_step(self) -> Optional[WorkflowStep]:
-        steps = self._get_workflow_steps()
-        for step in steps:
-            if step.state == self.current_state:
-                return step
-        return None
+        # The step list only depends on the machine, so it is indexed once per
+        # machine instead of being rebuilt on every lookup
+        cached = self._workflow_steps_by_state
+        if cached is None or cached[0] is not self.machine:
+            cached = (self.machine, {step.state: step for step in self._get_workflow_steps()})
+            self._workflow_steps_by_state = cached
+        return cached[1].get(self.current_state)
 
 
     def get_current_step(self) -> Optional[Step]:
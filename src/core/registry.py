@@ -1,5 +1,5 @@
 import asyncio
-from typing import Set, Optional, List # Added Optional, List
+from typing import Set, Optional, List, Iterable, Tuple, Any
 
 from mcp import StdioServerParameters
 from pydantic import BaseModel, Field
@@ -43,6 +43,18 @@ class Registry:
         self.watched_root_paths: Set[str] = set()
         self.watcher_task = None  # Store the watcher task here
 
+    def _add_all(self, target: dict, items: Iterable[Tuple[str, Any]], kind: str) -> int:
+        """Insert key/item pairs into a registry dict in one pass, keeping existing entries."""
+        added = 0
+        for key, item in items:
+            if key in target:
+                if self.warn_on_duplicate_schemas:
+                    logger.warning(f"{kind} already exists: {key}")
+                continue
+            target[key] = item
+            added += 1
+        return added
+
     def get_schema(self, name: str) -> Schema | None:
         """Get schema by name."""
         return self.schemas.get(name)
@@ -67,6 +79,10 @@ class Registry:
         self.schemas[schema.name] = schema
         return schema
 
+    def add_schemas(self, schemas: Iterable[Schema]) -> int:
+        """Add several schemas to the registry, returning how many were new."""
+        return self._add_all(self.schemas, ((schema.name, schema) for schema in schemas), "Schema")
+
     # Resource methods
     def get_resource(self, name: str) -> Resource | None:
         """Get resource by URI."""
@@ -88,6 +104,10 @@ class Registry:
         self.resources[resource.name] = resource
         return resource
 
+    def add_resources(self, resources: Iterable[Resource]) -> int:
+        """Add several resources to the registry, returning how many were new."""
+        return self._add_all(self.resources, ((resource.name, resource) for resource in resources), "Resource")
+
     # Resource template methods
     def get_resource_template(self, uri_template: str) -> ResourceTemplate | None:
         """Get resource template by URI template."""
@@ -109,6 +129,10 @@ class Registry:
         self.resource_templates[uri_template] = template
         return template
 
+    def add_resource_templates(self, templates: Iterable[ResourceTemplate]) -> int:
+        """Add several resource templates to the registry, returning how many were new."""
+        return self._add_all(self.resource_templates, ((template.uriTemplate, template) for template in templates), "Resource template")
+
     # Prompt methods
     def get_prompt(self, name: str) -> Prompt | None:
         """Get prompt by name."""
@@ -130,6 +154,10 @@ class Registry:
         self.prompts[name] = prompt
         return prompt
 
+    def add_prompts(self, prompts: Iterable[Prompt]) -> int:
+        """Add several prompts to the registry, returning how many were new."""
+        return self._add_all(self.prompts, ((prompt.name, prompt) for prompt in prompts), "Prompt")
+
     # Tool methods
     def get_tool(self, name: str) -> Tool | None:
         """Get tool by name."""
@@ -151,6 +179,10 @@ class Registry:
         self.tools[name] = tool
         return tool
 
+    def add_tools(self, tools: Iterable[Tool]) -> int:
+        """Add several tools to the registry, returning how many were new."""
+        return self._add_all(self.tools, ((tool.name, tool) for tool in tools), "Tool")
+
 
     def add_dialog_template(self, name: str, template: DialogTemplate):
         """Add a dialog template to the registry."""
@@ -177,7 +209,7 @@ class Registry:
             return existing
 
         self.quickie_templates[name] = template
-        logger.debug(f"Added quickie template: {name}")
+        logger.debug("Added quickie template: {}", name)
         return template
 
     def get_quickie_template(self, name: str) -> Optional[QuickieTemplate]:
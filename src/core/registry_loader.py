@@ -1,15 +1,100 @@
-from pathlib import Path # Added Path
-import yaml
-from typing import Dict, List, Any
+import asyncio
+import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import Dict, List, Any, Optional
 
 from mcp import StdioServerParameters
 
 from src.core.registry import Registry
 # Add QuickieTemplateLoader to imports
-from src.core.config_loader import SchemaLoader, TemplateLoader, DialogTemplateLoader, QuickieTemplateLoader
+from src.core.config_loader import SchemaLoader, TemplateLoader, DialogTemplateLoader, QuickieTemplateLoader, load_yaml
 from src.core.config_types import Model
+from src.core.mcp_client import MCPClient
 from src.logging import logger
+from src.utils.lazy_import import lazy_import
+
+# Heavy clients that are only needed once the registry loads models
+litellm = lazy_import("litellm")
+ollama = lazy_import("ollama")
+
+
+_MISSING = object()
+
+# Model fields that models.yaml may override with a plain value comparison
+_OVERRIDE_SCALAR_KEYS = ('name', 'provider', 'context_length', 'input_cost', 'output_cost', 'metadata')
+_OVERRIDE_KNOWN_KEYS = frozenset(_OVERRIDE_SCALAR_KEYS) | {'capabilities'}
+
+# Mapping from litellm info keys to capability names
+_CAPABILITY_FLAGS = {
+    'supports_system_messages': 'system_message',
+    'supports_response_schema': 'response_schema',
+    'supports_tool_choice': 'tool_choice',
+    'supports_function_calling': 'function_calling',
+    'supports_vision': 'vision',
+    'supports_audio_input': 'audio_input',
+    'supports_audio_output': 'audio_output',
+    'supports_native_streaming': 'native_streaming',
+    'supports_parallel_function_calling': 'parallel_function_calling',
+    'supports_embedding_image_input': 'embedding_image_input',
+    'supports_pdf_input': 'pdf_input',
+    'supports_prompt_caching': 'prompt_caching',
+    'supports_assistant_prefill': 'assistant_prefill',
+}
+
+# Mapping from litellm model modes to capability names
+_MODE_CAPABILITIES = {
+    'chat': 'chat',
+    'completion': 'completion',
+    'embedding': 'embedding',
+    'image_generation': 'image_generation',
+    'audio_transcription': 'audio_transcription',
+}
+
+
+@lru_cache(maxsize=None)
+def _get_model_info(model_name: str) -> Dict[str, Any]:
+    """Memoized litellm.utils.get_model_info; failed lookups are not cached."""
+    return litellm.utils.get_model_info(model_name)
+
+
+@lru_cache(maxsize=8)
+def _parse_yaml_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a YAML file, cached on its stat signature so edits invalidate the entry."""
+    with open(path, 'rb') as f:
+        return load_yaml(f)
+
+
+def _skip_if_empty(section: str):
+    """
+    Decorator for RegistryBuilder loaders that skips the loader when its config section is empty.
 
+    Args:
+        section: Human readable name of the config section, used in the warning
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, value, *args, **kwargs):
+            if not value:
+                logger.warning(f"No {section} specified in configuration")
+                return None
+            return method(self, value, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _override_value(upstream_data: Dict[str, Any], applied: Dict[str, Any], overrides: Dict[str, Any], key: str, config_value: Any) -> None:
+    """Record a single config value that differs from (or is missing) upstream."""
+    upstream_value = upstream_data.get(key, _MISSING)
+    if upstream_value is _MISSING:
+        # Key exists in config but not upstream (e.g. cost)
+        applied[key] = config_value
+        overrides[key] = {'config': config_value, 'upstream': None}
+    elif upstream_value != config_value:
+        applied[key] = config_value
+        overrides[key] = {'config': config_value, 'upstream': upstream_value}
 
 
 class RegistryBuilder:
@@ -38,14 +123,16 @@ class RegistryBuilder:
             Dictionary containing the configuration
         """
         try:
-            with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
-            logger.info(f"Loaded configuration from {self.config_path}")
+            stat = os.stat(self.config_path)
+            # Callers may mutate the config, so hand out a copy of the cached parse
+            config = copy.deepcopy(_parse_yaml_cached(self.config_path, stat.st_mtime_ns, stat.st_size))
+            logger.info("Loaded configuration from {}", self.config_path)
             return config
         except Exception as e:
             logger.error(f"Failed to load configuration from {self.config_path}: {str(e)}")
             return {}
 
+    @_skip_if_empty("schema modules")
     def _load_schemas(self, schema_modules: List[str]) -> None:
         """
         Load schemas from the specified modules.
@@ -53,18 +140,18 @@ class RegistryBuilder:
         Args:
             schema_modules: List of module names to load schemas from
         """
-        if not schema_modules:
-            logger.warning("No schema modules specified in configuration")
-            return
-
-        logger.info(f"Loading schemas from modules: {schema_modules}")
+        logger.info("Loading schemas from modules: {}", schema_modules)
         schema_loader = SchemaLoader(self.registry)
-        for module_name in schema_modules:
-            try:
-                schema_loader.load_from_module(module_name)
-            except Exception as e:
-                logger.error(f"Failed to load schemas from module {module_name}: {str(e)}")
+        # Imports overlap on worker threads; schemas are registered here, in config order
+        with ThreadPoolExecutor(max_workers=min(8, len(schema_modules))) as executor:
+            futures = [executor.submit(schema_loader.collect_from_module, module_name) for module_name in schema_modules]
+            for module_name, future in zip(schema_modules, futures):
+                try:
+                    self.registry.add_schemas(future.result())
+                except Exception as e:
+                    logger.error(f"Failed to load schemas from module {module_name}: {str(e)}")
 
+    @_skip_if_empty("template paths")
     def _load_templates(self, template_paths: Dict[str, str]) -> None:
         """
         Load templates from the specified paths.
@@ -72,12 +159,10 @@ class RegistryBuilder:
         Args:
             template_paths: Dictionary mapping aliases to template directories
         """
-        if not template_paths:
-            logger.warning("No template paths specified in configuration")
-            return
+        # src.dependencies imports this module, so resolve it lazily
         from src.dependencies import get_jinja
 
-        logger.info(f"Loading templates from paths: {template_paths}")
+        logger.info("Loading templates from paths: {}", template_paths)
         template_loader = TemplateLoader(self.registry, get_jinja().templates.env)
         for alias, path in template_paths.items():
             try:
@@ -85,6 +170,7 @@ class RegistryBuilder:
             except Exception as e:
                 logger.error(f"Failed to load templates from {path} with alias {alias}: {str(e)}")
 
+    @_skip_if_empty("MCP servers")
     def _load_mcp_servers(self, mcp_servers: Dict[str, Dict[str, Any]]) -> None:
         """
         Load MCP server configurations.
@@ -92,21 +178,13 @@ class RegistryBuilder:
         Args:
             mcp_servers: Dictionary mapping server names to server configurations
         """
-        if not mcp_servers:
-            logger.warning("No MCP servers specified in configuration")
-            return
-
-        logger.info(f"Loading MCP server configurations: {list(mcp_servers.keys())}")
+        logger.opt(lazy=True).info("Loading MCP server configurations: {}", lambda: list(mcp_servers))
         for name, config in mcp_servers.items():
             try:
                 # Create StdioServerParameters from config
-                server_params = StdioServerParameters(
-                    command=config.get('command'),
-                    args=config.get('args', []),
-                    env=config.get('env', {})
-                )
+                server_params = StdioServerParameters(**{'args': [], 'env': {}, **config})
                 self.registry.mcp_servers[name] = server_params
-                logger.info(f"Loaded MCP server configuration: {name}")
+                logger.info("Loaded MCP server configuration: {}", name)
             except Exception as e:
                 logger.error(f"Failed to load MCP server configuration for {name}: {str(e)}")
 
@@ -117,13 +195,21 @@ class RegistryBuilder:
         Args:
             templates_dir: Directory containing dialog template YAML files
         """
-        logger.info(f"Loading dialog templates from directory: {templates_dir}")
+        directory = Path(templates_dir)
+        if not directory.is_dir():
+            logger.warning(f"Dialog templates directory not found: {templates_dir}")
+            return
+        if not any(p.suffix.lower() in ('.yaml', '.yml') for p in directory.iterdir()):
+            logger.info("No dialog template files found in {}", templates_dir)
+            return
+
+        logger.info("Loading dialog templates from directory: {}", templates_dir)
         template_loader = DialogTemplateLoader(self.registry)
         try:
             templates = template_loader.load_from_directory(templates_dir)
             for name, template in templates.items():
                 self.registry.add_dialog_template(name, template)
-            logger.info(f"Loaded {len(templates)} dialog templates")
+            logger.info("Loaded {} dialog templates", len(templates))
         except Exception as e:
             logger.error(f"Failed to load dialog templates from {templates_dir}: {str(e)}")
 
@@ -134,7 +220,7 @@ class RegistryBuilder:
         Args:
             templates_path: Path to the YAML file or directory containing quickie templates
         """
-        logger.info(f"Attempting to load quickie templates from: {templates_path}")
+        logger.info("Attempting to load quickie templates from: {}", templates_path)
         path = Path(templates_path)
         loader = QuickieTemplateLoader(self.registry)
         templates = {}
@@ -163,72 +249,92 @@ class RegistryBuilder:
             for name, template in templates.items():
                 self.registry.add_quickie_template(name, template)
 
-            logger.info(f"Finished loading {len(templates)} quickie templates.")
+            logger.info("Finished loading {} quickie templates.", len(templates))
 
         except Exception as e:
             logger.error(f"Failed during quickie template loading process from {templates_path}: {str(e)}")
 
 
-    def _load_models(self) -> None:
+    def _load_models_config(self, config_path: str = "config/models.yaml") -> Dict[str, Dict[str, Any]]:
+        """
+        Load the selected model definitions from models.yaml.
+
+        Args:
+            config_path: Path to the models.yaml file
+
+        Returns:
+            Dictionary mapping model IDs to their configured values
+        """
+        try:
+            stat = os.stat(config_path)
+        except FileNotFoundError:
+            return {}
+        try:
+            yaml_data = _parse_yaml_cached(config_path, stat.st_mtime_ns, stat.st_size)
+            if yaml_data and 'models' in yaml_data:
+                # Model construction may keep references into the entries, so copy the cached parse
+                config_models = copy.deepcopy(yaml_data['models'])
+                logger.info("Loaded {} models from {}", len(config_models), config_path)
+                return config_models
+        except Exception as e:
+            logger.error(f"Failed to load models from {config_path}: {str(e)}")
+        return {}
+
+    def _load_models(self, config_models: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
         """
         Load available LLM models from config/models.yaml, Ollama, and LiteLLM.
         Merges configuration and tracks selection status.
+
+        Args:
+            config_models: Already-parsed models.yaml entries; read from disk if not given
         """
-        import litellm.utils
-        import ollama
-        from pathlib import Path
         logger.info("Loading available LLM models")
 
-        config_models: Dict[str, Dict[str, Any]] = {}
         upstream_models: Dict[str, Dict[str, Any]] = {}
-        final_models: Dict[str, Model] = {}
+        final_models: List[Model] = []
 
         # 1. Load models from config/models.yaml
-        config_path = Path("config/models.yaml")
-        if config_path.exists():
-            try:
-                with open(config_path, 'r') as f:
-                    yaml_data = yaml.safe_load(f)
-                    if yaml_data and 'models' in yaml_data:
-                        config_models = yaml_data['models']
-                        logger.info(f"Loaded {len(config_models)} models from {config_path}")
-            except Exception as e:
-                logger.error(f"Failed to load models from {config_path}: {str(e)}")
+        if config_models is None:
+            config_models = self._load_models_config()
 
         # 2. Load models from upstream: Ollama
         try:
             ollama_response = ollama.list()
-            for model_data in ollama_response.get('models', []):
-                model_id = 'ollama_chat/' + model_data['model']
+            # Build directly from the listing; litellm's lookup for local tags is
+            # slow and raises for most of them.
+            for ollama_model in ollama_response.models:
                 try:
-                    # Use litellm to get standardized info, but prioritize ollama's own data if needed
-                    model_info = litellm.utils.get_model_info(model_id)
-                    upstream_model_data = self._parse_model_from_litellm(model_info)
-                    # Ensure the ID uses the ollama_chat prefix
-                    upstream_model_data['id'] = model_id
-                    upstream_models[model_id] = upstream_model_data
-                    logger.debug(f"Loaded upstream Ollama model: {model_id}")
+                    model_data = self._parse_model_from_ollama(ollama_model)
                 except Exception as e:
-                    logger.warning(f"Could not get detailed info for Ollama model {model_id}: {e}. Skipping.")
+                    # A malformed entry (e.g. no model name) only drops that entry
+                    logger.warning(f"Could not parse Ollama model {ollama_model!r}: {e}. Skipping.")
+                    continue
+                upstream_models[model_data['id']] = model_data
+            logger.debug("Loaded {} upstream Ollama models", len(upstream_models))
         except Exception as e:
             logger.error(f"Failed to load Ollama models: {str(e)}")
 
         # 3. Load models from upstream: LiteLLM (excluding ollama handled above)
         try:
             litellm_valid_models = litellm.utils.get_valid_models()
+            # get_model_info raises for names missing from the cost map; skip those up front
+            known_models = litellm.model_cost.keys()
             for model_name in litellm_valid_models:
                 if model_name.startswith('ollama'): # Already handled
                     continue
+                if model_name not in known_models and model_name.partition('/')[2] not in known_models:
+                    logger.debug("LiteLLM model {} not in the model cost map. Skipping.", model_name)
+                    continue
                 try:
-                    model_info = litellm.utils.get_model_info(model_name)
+                    model_info = _get_model_info(model_name)
                     upstream_model_data = self._parse_model_from_litellm(model_info)
                     model_id = upstream_model_data['id']
                     if model_id not in upstream_models: # Avoid duplicates if get_valid_models has aliases
                         upstream_models[model_id] = upstream_model_data
-                        logger.debug(f"Loaded upstream LiteLLM model: {model_id}")
+                        logger.debug("Loaded upstream LiteLLM model: {}", model_id)
                 except Exception as e:
                     # It's common for get_model_info to fail for some models listed by get_valid_models
-                    logger.debug(f"Could not get detailed info for LiteLLM model {model_name}: {e}. Skipping.")
+                    logger.debug("Could not get detailed info for LiteLLM model {}: {}. Skipping.", model_name, e)
         except Exception as e:
             logger.error(f"Failed to load LiteLLM models: {str(e)}")
 
@@ -236,43 +342,17 @@ class RegistryBuilder:
         processed_config_ids = set()
 
         for model_id, upstream_data in upstream_models.items():
-            overrides = {}
-            selected = False
-            final_data = upstream_data.copy() # Start with upstream data
-            final_data['upstream_present'] = True
+            applied, overrides = {}, {}
+            selected = model_id in config_models
 
-            if model_id in config_models:
-                selected = True
+            if selected:
                 processed_config_ids.add(model_id)
-                config_data = config_models[model_id]
-
-                # Apply config values over upstream values and track overrides
-                for key, config_value in config_data.items():
-                    # Convert capabilities list back to set for comparison if needed
-                    if key == 'capabilities' and isinstance(config_value, list):
-                         config_value_internal = set(config_value)
-                    else:
-                         config_value_internal = config_value
-
-                    if key in final_data and final_data[key] != config_value_internal:
-                        # Handle set comparison for capabilities
-                        if key == 'capabilities':
-                            if set(final_data[key]) != config_value_internal:
-                                overrides[key] = {'config': sorted(list(config_value_internal)), 'upstream': sorted(list(final_data[key]))}
-                                final_data[key] = config_value_internal # Apply override
-                        else:
-                            overrides[key] = {'config': config_value, 'upstream': final_data[key]}
-                            final_data[key] = config_value # Apply override
-                    elif key not in final_data:
-                         # Key exists in config but not upstream (e.g. cost)
-                         final_data[key] = config_value
-                         overrides[key] = {'config': config_value, 'upstream': None}
-
-
-            final_data['selected'] = selected
-            final_data['overrides'] = overrides
+                # Config values win over upstream values; overrides are tracked for display
+                applied, overrides = self._diff_config_overrides(upstream_data, config_models[model_id])
+
+            final_data = upstream_data | applied | {'upstream_present': True, 'selected': selected, 'overrides': overrides}
             try:
-                final_models[model_id] = Model(**final_data)
+                final_models.append(Model(**final_data))
             except Exception as e:
                 logger.error(f"Failed to validate merged model data for {model_id}: {e}. Data: {final_data}")
 
@@ -289,17 +369,53 @@ class RegistryBuilder:
                 if 'capabilities' in final_data and isinstance(final_data['capabilities'], list):
                     final_data['capabilities'] = set(final_data['capabilities'])
                 try:
-                    final_models[model_id] = Model(**final_data)
+                    final_models.append(Model(**final_data))
                 except Exception as e:
                     logger.error(f"Failed to validate config-only model data for {model_id}: {e}. Data: {final_data}")
 
 
         # 6. Add all processed models to the registry
-        for model in final_models.values():
+        for model in final_models:
             self.registry.add_model(model)
 
-        logger.info(f"Final loaded models count: {len(self.registry.models)}")
+        logger.info("Final loaded models count: {}", len(self.registry.models))
+
+
+    @staticmethod
+    def _diff_config_overrides(upstream_data: Dict[str, Any], config_data: Dict[str, Any]) -> tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """
+        Compare models.yaml values against upstream model data.
+
+        Args:
+            upstream_data: Model data parsed from the upstream source
+            config_data: Model entry from models.yaml
 
+        Returns:
+            Tuple of (values to merge over upstream, overridden keys to their config and upstream values)
+        """
+        applied: Dict[str, Any] = {}
+        overrides: Dict[str, Dict[str, Any]] = {}
+
+        # Capabilities are compared as sets, regardless of how they were declared
+        if 'capabilities' in config_data:
+            config_capabilities = set(config_data['capabilities'])
+            upstream_capabilities = upstream_data.get('capabilities', _MISSING)
+            if upstream_capabilities is _MISSING:
+                applied['capabilities'] = config_capabilities
+                overrides['capabilities'] = {'config': config_data['capabilities'], 'upstream': None}
+            elif set(upstream_capabilities) != config_capabilities:
+                applied['capabilities'] = config_capabilities
+                overrides['capabilities'] = {'config': sorted(config_capabilities), 'upstream': sorted(upstream_capabilities)}
+
+        for key in _OVERRIDE_SCALAR_KEYS:
+            if key in config_data:
+                _override_value(upstream_data, applied, overrides, key, config_data[key])
+
+        # Cold path: keys outside the known model fields (e.g. id)
+        for key in config_data.keys() - _OVERRIDE_KNOWN_KEYS:
+            _override_value(upstream_data, applied, overrides, key, config_data[key])
+
+        return applied, overrides
 
     async def build(self) -> Registry:
         """
@@ -308,9 +424,11 @@ class RegistryBuilder:
         Returns:
             The populated Registry instance
         """
-        # Load the configuration file
-        self.config = self._load_config()
+        # Read bs.yaml and models.yaml concurrently; models.yaml is only needed at the end
+        models_config_task = asyncio.create_task(asyncio.to_thread(self._load_models_config))
+        self.config = await asyncio.to_thread(self._load_config)
         if not self.config:
+            models_config_task.cancel()
             logger.error("Failed to load configuration, using empty registry")
             return self.registry
 
@@ -339,7 +457,7 @@ class RegistryBuilder:
         self._load_quickie_templates(quickie_templates_path) # Load after prompts/tools
 
         # Load available LLM models
-        self._load_models() # Load after quickies/dialogs to potentially validate models used
+        self._load_models(await models_config_task) # Load after quickies/dialogs to potentially validate models used
 
         logger.info("Registry building completed")
         return self.registry
@@ -349,72 +467,81 @@ class RegistryBuilder:
         Connect to all configured MCP servers.
         """
         logger.info("Connecting to MCP servers")
-        from src.dependencies import get_mcp_client
+        # src.dependencies imports this module, so resolve it lazily
+        from src.dependencies import get_mcp_client_instance
+        mcp_client = await get_mcp_client_instance()
+
+        # Connect one server at a time from this task: each connection enters
+        # anyio task groups on the client's shared exit stack, and those must
+        # be exited by the task that entered them. Failures are logged per server.
         for name, server_params in self.registry.mcp_servers.items():
-            try:
-                # Get the singleton mcp_client instance
-                async for mcp_client in get_mcp_client():
-                    await mcp_client.connect_to_server(name, server_params)
-
-                    session = await mcp_client.get_session(name)
-                    if session and mcp_client.sessions.get(name) and mcp_client.sessions.get(name).has_tools():
-                        tools_result = await session.list_tools()
-                        for tool in tools_result.tools:
-                            self.registry.add_tool(tool.name, tool)
-                            logger.debug(f"Added tool: {tool.name}")
-                    if session and mcp_client.sessions.get(name) and mcp_client.sessions.get(name).has_prompts():
-                        prompts_result = await session.list_prompts()
-                        for prompt in prompts_result.prompts:
-                            self.registry.add_prompt(prompt.name, prompt)
-                            logger.debug(f"Added prompt: {prompt.name}")
-                    if session and mcp_client.sessions.get(name) and mcp_client.sessions.get(name).has_resources():
-                        resources_result = await session.list_resources()
-                        for resource in resources_result.resources:
-                            self.registry.add_resource(resource)
-                            logger.debug(f"Added resource: {resource.uri}")
-                        templates_result = await session.list_resource_templates()
-                        for template in templates_result.resourceTemplates:
-                            self.registry.add_resource_template(template.uriTemplate, template)
-                            logger.debug(f"Added resource template: {template.uriTemplate}")
-
-                    logger.info(f"Connected to MCP server: {name}")
-            except Exception as e:
-                logger.error(f"Failed to connect to MCP server {name}: {str(e)}")
+            await self._connect_mcp_server(mcp_client, name, server_params)
+
+    async def _connect_mcp_server(self, mcp_client: MCPClient, name: str, server_params: StdioServerParameters) -> None:
+        """
+        Connect to a single MCP server and register its tools, prompts and resources.
+
+        Args:
+            mcp_client: The shared MCP client to open the session on
+            name: Name of the server
+            server_params: Parameters used to launch the server
+        """
+        try:
+            await mcp_client.connect_to_server(name, server_params)
+
+            session_data = mcp_client.sessions.get(name)
+            session = session_data.session if session_data else None
+            listings = {}
+            if session and session_data.has_tools():
+                listings['tools'] = session.list_tools()
+            if session and session_data.has_prompts():
+                listings['prompts'] = session.list_prompts()
+            if session and session_data.has_resources():
+                listings['resources'] = session.list_resources()
+                listings['resource_templates'] = session.list_resource_templates()
+
+            # The listings are independent requests on the same session
+            results = dict(zip(listings, await asyncio.gather(*listings.values())))
+
+            if 'tools' in results:
+                added = self.registry.add_tools(results['tools'].tools)
+                logger.debug("Added {} tools from {}", added, name)
+            if 'prompts' in results:
+                added = self.registry.add_prompts(results['prompts'].prompts)
+                logger.debug("Added {} prompts from {}", added, name)
+            if 'resources' in results:
+                added = self.registry.add_resources(results['resources'].resources)
+                logger.debug("Added {} resources from {}", added, name)
+            if 'resource_templates' in results:
+                added = self.registry.add_resource_templates(results['resource_templates'].resourceTemplates)
+                logger.debug("Added {} resource templates from {}", added, name)
+
+            logger.info("Connected to MCP server: {}", name)
+        except Exception as e:
+            logger.error(f"Failed to connect to MCP server {name}: {str(e)}")
+
+    def _parse_model_from_ollama(self, model_data: 'ollama.ListResponse.Model') -> Dict[str, Any]:
+        """Parses a model entry from Ollama's list response into a dictionary."""
+        name = model_data.model
+        return {
+            "id": 'ollama_chat/' + name,
+            "name": name,
+            "provider": "ollama_chat",
+            "input_cost": 0.0, # Costs are always zero for local models
+            "output_cost": 0.0,
+            "capabilities": {'chat'},
+            "metadata": model_data.model_dump(mode='json'),
+        }
 
     def _parse_model_from_litellm(self, model_info: Dict[str, Any]) -> Dict[str, Any]:
         """Parses model information from LiteLLM's get_model_info result into a dictionary."""
-        capabilities = set()
-        # Mapping from litellm info keys to capability names
-        capability_map = {
-            'supports_system_messages': 'system_message',
-            'supports_response_schema': 'response_schema',
-            'supports_tool_choice': 'tool_choice',
-            'supports_function_calling': 'function_calling',
-            'supports_vision': 'vision',
-            'supports_audio_input': 'audio_input',
-            'supports_audio_output': 'audio_output',
-            'supports_native_streaming': 'native_streaming',
-            'supports_parallel_function_calling': 'parallel_function_calling',
-            'supports_embedding_image_input': 'embedding_image_input',
-            'supports_pdf_input': 'pdf_input',
-            'supports_prompt_caching': 'prompt_caching',
-            'supports_assistant_prefill': 'assistant_prefill',
-        }
-        for info_key, cap_name in capability_map.items():
-            if model_info.get(info_key):
-                capabilities.add(cap_name)
+        # Only the flags actually present in model_info are visited
+        capabilities = {_CAPABILITY_FLAGS[info_key] for info_key in _CAPABILITY_FLAGS.keys() & model_info.keys() if model_info[info_key]}
 
         # Mode-based capabilities
-        mode_capability_map = {
-            'chat': 'chat',
-            'completion': 'completion',
-            'embedding': 'embedding',
-            'image_generation': 'image_generation',
-            'audio_transcription': 'audio_transcription',
-        }
-        mode = model_info.get('mode')
-        if mode and mode in mode_capability_map:
-            capabilities.add(mode_capability_map[mode])
+        mode_capability = _MODE_CAPABILITIES.get(model_info.get('mode'))
+        if mode_capability:
+            capabilities.add(mode_capability)
 
         # Determine the canonical model ID (provider/key)
         provider = model_info.get('litellm_provider')
@@ -440,63 +567,3 @@ class RegistryBuilder:
             "capabilities": capabilities,
             "metadata": model_info # Store the raw info as metadata
         }
-
-    def _load_model_from_litellm(self, model_info):
-        # This method is kept for potential backward compatibility or direct use if needed,
-        # but the primary loading now uses _parse_model_from_litellm within _load_models.
-        # It now directly returns a Model instance based on the parsed data.
-        parsed_data = self._parse_model_from_litellm(model_info)
-        return Model(**parsed_data)
-
-
-        capabilities = set()
-        if model_info.get('supports_system_messages'):
-            capabilities.add('system_message')
-        if model_info.get('supports_response_schema'):
-            capabilities.add('response_schema')
-        if model_info.get('supports_tool_choice'):
-            capabilities.add('tool_choice')
-        if model_info.get('supports_function_calling'):
-            capabilities.add('function_calling')
-        if model_info.get('supports_vision'):
-            capabilities.add('vision')
-        if model_info.get('supports_audio_input'):
-            capabilities.add('audio_input')
-        if model_info.get('supports_audio_output'):
-            capabilities.add('audio_output')
-        if model_info.get('supports_native_streaming'):
-            capabilities.add('native_streaming')
-        if model_info.get('supports_parallel_function_calling'):
-            capabilities.add('parallel_function_calling')
-        if model_info.get('supports_embedding_image_input'):
-            capabilities.add('embedding_image_input')
-        if model_info.get('supports_pdf_input'):
-            capabilities.add('pdf_input')
-        if model_info.get('supports_prompt_caching'):
-            capabilities.add('prompt_caching')
-        if model_info.get('supports_assistant_prefill'):
-            capabilities.add('assistant_prefill')
-        if model_info.get('mode') == 'chat':
-            capabilities.add('chat')
-        if model_info.get('mode') == 'completion':
-            capabilities.add('completion')
-        if model_info.get('mode') == 'embedding':
-            capabilities.add('embedding')
-        if model_info.get('mode') == 'image_generation':
-            capabilities.add('image_generation')
-        if model_info.get('mode') == 'audio_transcription':
-            capabilities.add('audio_transcription')
-
-        if model_info.get('key').startswith(model_info.get('litellm_provider') + '/'):
-            model_id = model_info.get('key')
-        else:
-            model_id = model_info.get('litellm_provider') + '/' + model_info.get('key')
-
-        return Model(
-            id=model_id,
-            name=model_info.get('key'),
-            provider=model_info.get('litellm_provider'),
-            context_length=model_info.get('max_input_tokens'),
-            capabilities=capabilities,
-            metadata=model_info
-        )
@@ -1,16 +1,52 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import quote_plus as _quote_plus
+
 from markdown2 import markdown
 
+from src.logging import logger
 from src.utils.file_types import format_file_size as file_size_formatter, get_file_icon_by_name
 
+MARKDOWN_EXTRAS = {
+    'breaks': {'on_newline': True},
+    'fenced-code-blocks': {},
+    'highlightjs-lang': {},
+}
+
+# Rendered messages re-render on every page load, so HTML is cached per source
+# text. Entries are whole user messages, so the cache is bounded by the total
+# characters held (source + HTML) rather than by entry count.
+MARKDOWN_CACHE_MAX_CHARS = 8 * 1024 * 1024
+_markdown_cache: "OrderedDict[str, str]" = OrderedDict()
+_markdown_cache_chars = 0
+_markdown_cache_lock = threading.Lock()
+
+
 def markdown2html(text: str):
     """Convert markdown text to HTML"""
-    from src.main import logger
-    logger.debug(f"Converting markdown to html: {text}")
-    return markdown(text, extras={
-        'breaks': {'on_newline': True},
-        'fenced-code-blocks': {},
-        'highlightjs-lang': {},
-    })
+    global _markdown_cache_chars
+
+    with _markdown_cache_lock:
+        html = _markdown_cache.get(text)
+        if html is not None:
+            _markdown_cache.move_to_end(text)
+            return html
+
+    logger.debug("Converting markdown to html: {}", text)
+    html = markdown(text, extras=MARKDOWN_EXTRAS)
+
+    entry_chars = len(text) + len(html)
+    # An entry larger than a quarter of the budget would evict most of the cache
+    if entry_chars <= MARKDOWN_CACHE_MAX_CHARS // 4:
+        with _markdown_cache_lock:
+            if text not in _markdown_cache:
+                _markdown_cache[text] = html
+                _markdown_cache_chars += entry_chars
+                while _markdown_cache_chars > MARKDOWN_CACHE_MAX_CHARS:
+                    old_text, old_html = _markdown_cache.popitem(last=False)
+                    _markdown_cache_chars -= len(old_text) + len(old_html)
+    return html
 
 def format_text_length(length: int) -> str:
     """Format text length to human readable format, 8k, 1M, 1G, etc."""
@@ -36,9 +72,7 @@ def format_cost_per_million(cost_param: int) -> str:
     return f"{(cost_param * 1000):.4f}"
 
 def quote_plus(url: str) -> str:
-    from urllib.parse import quote_plus
-
-    return quote_plus(url)
+    return _quote_plus(url)
 
 
 
@@ -47,6 +81,7 @@ def format_file_size(byte_size):
     return file_size_formatter(byte_size)
 
 
+@lru_cache(maxsize=4096)
 def get_file_icon(filename):
     """
     Return the appropriate FontAwesome icon class for a given filename.
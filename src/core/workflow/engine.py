@@ -1,12 +1,13 @@
-from typing import Dict, List, Optional, Protocol, Tuple
+from typing import Any, Dict, List, Optional, Protocol, Tuple
 import uuid
+import weakref
 
 from transitions.extensions import AsyncGraphMachine
 
 from src.core.config_types import DialogTemplate
 from src.core.workflow.handlers.base import StepHandler, StepResult
 
-from src.core.workflow.visualization import BikeShedState
+from src.core.workflow.visualization import BikeShedState, WorkflowVisualizer
 from src.core.models import Dialog, DialogStatus
 from src.logging import logger
 
@@ -25,6 +26,9 @@ class WorkflowEngine:
     ):
         self.persistence = persistence_provider
         self.handlers = handlers
+        # State specs and transitions per template object, keyed by id() and
+        # evicted when the template is garbage collected
+        self._config_cache: Dict[int, Tuple[List[Tuple], List[Dict[str, Any]]]] = {}
 
     async def initialize_dialog(self, dialog: Dialog):
         """Initialize a state machine for a dialog"""
@@ -55,11 +59,26 @@ class WorkflowEngine:
 
     def _build_state_machine_config(self, template: DialogTemplate) -> Tuple[List, List]:
         """Build states and transitions config for state machine"""
-        # Create start and end states with custom labels
+        key = id(template)
+        cached = self._config_cache.get(key)
+        if cached is None:
+            cached = self._compile_state_machine_config(template)
+            self._config_cache[key] = cached
+            weakref.finalize(template, self._config_cache.pop, key, None)
+
+        state_specs, transitions = cached
+        # transitions attaches model callbacks to State objects, so every
+        # machine gets fresh states built from the cached specs
         states = [
-            BikeShedState('start', label='Start'),
-            BikeShedState('end', label='End', final=True)
+            BikeShedState(name, label=label, final=final, step_data=step)
+            for name, label, final, step in state_specs
         ]
+        return states, transitions
+
+    def _compile_state_machine_config(self, template: DialogTemplate) -> Tuple[List[Tuple], List[Dict[str, Any]]]:
+        """Compute (name, label, final, step) state specs and transitions for a template"""
+        # Create start state with custom label; end is appended after the steps
+        state_specs = [('start', 'Start', None, None)]
         transitions = []
 
         enabled_steps = [step for step in template.steps if step.enabled]
@@ -67,8 +86,8 @@ class WorkflowEngine:
         for i, step in enumerate(enabled_steps):
             # Add state with step data for better visualization
             state_name = f'step_{i}'
-            state = BikeShedState(state_name, step_data=step)
-            states.insert(len(states) - 1, state)
+            state_spec = (state_name, WorkflowVisualizer.create_state_label(step), None, step)
+            state_specs.append(state_spec)
 
             # Add transition to this state with step data for better visualization
             source = 'start' if i == 0 else f'step_{i-1}'
@@ -91,7 +110,9 @@ class WorkflowEngine:
                     'before': self._finalize_workflow,
                 })
 
-        return states, transitions
+        state_specs.append(('end', 'End', True, None))
+
+        return state_specs, transitions
 
     async def _after_state_change(self, event):
         """Handle state change events"""
@@ -162,6 +183,14 @@ class WorkflowEngine:
         dialog = event.model
         dialog.status = 'completed'
 
+    @staticmethod
+    def _in_final_state(dialog: Dialog) -> bool:
+        """Check whether the dialog sits in a final state of its machine"""
+        if dialog.machine is None:
+            return False
+        state = dialog.machine.states.get(dialog.current_state)
+        return bool(getattr(state, 'final', False))
+
     async def execute_next_step(self, dialog: Dialog) -> StepResult:
         """Execute the next step in the workflow"""
         current_workflow_step = dialog.get_current_workflow_step()
@@ -171,8 +200,11 @@ class WorkflowEngine:
                 state=dialog.current_state,
                 message="No more steps to execute"
             )
-            # Ensure dialog is saved even when there are no more steps
-            await self.persistence.save_dialog(dialog)
+            # Reaching the final state was already persisted by
+            # _after_state_change; save in every other case, including a
+            # missing machine or an unregistered state
+            if not self._in_final_state(dialog):
+                await self.persistence.save_dialog(dialog)
             return result
 
         # Find the trigger for this step
@@ -180,12 +212,13 @@ class WorkflowEngine:
 
         logger.debug(f"[workflow] Executing step {trigger_name}")
 
-        # Check if the trigger exists
-        if hasattr(dialog, trigger_name):
-            trigger_method = getattr(dialog, trigger_name)
-
+        # Look the event up on the machine directly; the trigger methods bound
+        # onto the dialog are partials of Event.trigger, reached through
+        # pydantic's extra-attribute __getattr__ fallback
+        event = dialog.machine.events.get(trigger_name)
+        if event is not None:
             try:
-                await trigger_method()
+                await event.trigger(dialog)
 
                 logger.debug(f"[workflow] Executing step {trigger_name}")
 
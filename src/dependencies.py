@@ -37,7 +37,11 @@ async def get_db() -> AsyncGenerator[AsyncConnection, None]:
         yield conn
 
 async def get_cache() -> AsyncGenerator[RedisService, None]:
-    yield RedisService(redis_url=str(settings.redis_url))
+    cache = RedisService(redis_url=str(settings.redis_url))
+    try:
+        yield cache
+    finally:
+        await cache.close()
 
 # Add this new dependency function
 async def get_user_state_service(cache: RedisService = Depends(get_cache)) -> UserStateService:
@@ -78,8 +82,8 @@ mcp_client = MCPClient()
 _mcp_client_initialized = False
 
 
-async def get_mcp_client() -> AsyncGenerator[MCPClient, None]:
-    """Dependency for getting the singleton MCPClient instance"""
+async def get_mcp_client_instance() -> MCPClient:
+    """Get the singleton MCPClient instance, initializing it on first use"""
     global _mcp_client_initialized
 
     # Only enter the context manager once
@@ -87,8 +91,12 @@ async def get_mcp_client() -> AsyncGenerator[MCPClient, None]:
         await mcp_client.__aenter__()
         _mcp_client_initialized = True
 
-    # Simply yield the singleton instance
-    yield mcp_client
+    return mcp_client
+
+
+async def get_mcp_client() -> AsyncGenerator[MCPClient, None]:
+    """Dependency for getting the singleton MCPClient instance"""
+    yield await get_mcp_client_instance()
 
 # Create the singleton Registry instance
 registry = Registry()
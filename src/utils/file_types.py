@@ -1,7 +1,8 @@
 import os
 import mimetypes
+import threading
 import magic
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 # Initialize mimetypes with standard types
 mimetypes.init()
@@ -89,20 +90,37 @@ DIRECTORY_TYPE = ('inode/directory', 'fa-solid fa-folder')
 # Default for unknown types
 DEFAULT_TYPE = ('application/octet-stream', 'fa-solid fa-file')
 
+# libmagic cookies, one per thread; loading the magic database is the
+# expensive part, and magic.Magic serialises calls on an internal lock, so a
+# single shared instance would make concurrent scanner threads queue up
+_mime_magic = threading.local()
 
-def get_file_type_info(filepath: str, use_magic_fallback: bool = True) -> Tuple[str, str]:
+
+def _get_mime_magic() -> magic.Magic:
+    """Return this thread's MIME-detecting magic.Magic instance."""
+    instance = getattr(_mime_magic, "instance", None)
+    if instance is None:
+        instance = _mime_magic.instance = magic.Magic(mime=True)
+    return instance
+
+
+def get_file_type_info(filepath: str, use_magic_fallback: bool = True, is_dir: Optional[bool] = None) -> Tuple[str, str]:
     """
     Get the MIME type and icon for a file.
     
     Args:
         filepath: Path to the file
         use_magic_fallback: Whether to use magic library as fallback for unknown extensions
+        is_dir: Whether the path is a directory, if the caller already knows;
+            checked on disk when None
         
     Returns:
         Tuple of (mime_type, icon_class)
     """
     # Handle directories as a special case
-    if os.path.isdir(filepath):
+    if is_dir is None:
+        is_dir = os.path.isdir(filepath)
+    if is_dir:
         return DIRECTORY_TYPE
     
     # Get extension (without the dot) and convert to lowercase
@@ -136,14 +154,14 @@ def get_file_type_info(filepath: str, use_magic_fallback: bool = True) -> Tuple[
     # As a last resort, use magic to detect the MIME type
     if use_magic_fallback:
         try:
-            detected_mime = magic.from_file(filepath, mime=True)
+            detected_mime = _get_mime_magic().from_file(filepath)
             
             # For text files detected by magic, try to be more specific based on extension
             if detected_mime == 'text/plain' and ext:
                 # Check if this extension should be a specific text type
-                for known_ext, (known_mime, icon) in FILE_TYPE_MAP.items():
-                    if known_ext == ext and known_mime.startswith('text/'):
-                        return (known_mime, icon)
+                known = FILE_TYPE_MAP.get(ext)
+                if known and known[0].startswith('text/'):
+                    return known
             
             # For known MIME categories, use appropriate icons
             if detected_mime.startswith('text/'):
@@ -164,9 +182,9 @@ def get_file_type_info(filepath: str, use_magic_fallback: bool = True) -> Tuple[
     return DEFAULT_TYPE
 
 
-def get_mime_type(filepath: str) -> str:
+def get_mime_type(filepath: str, is_dir: Optional[bool] = None) -> str:
     """Get just the MIME type for a file."""
-    return get_file_type_info(filepath)[0]
+    return get_file_type_info(filepath, is_dir=is_dir)[0]
 
 
 def get_file_icon(filepath: str) -> str:
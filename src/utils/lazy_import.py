@@ -0,0 +1,33 @@
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return a module whose import is deferred until an attribute is first accessed.
+
+    Modules that are already imported are returned as-is.
+
+    Args:
+        name: Fully qualified module name
+
+    Returns:
+        The module, or a lazy proxy for it
+
+    Raises:
+        ModuleNotFoundError: If the module cannot be found
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,129 @@
+import pytest
+from uuid import uuid4
+from datetime import datetime, timedelta
+
+from psycopg import AsyncConnection
+
+from src.core.models import Root, RootFile
+from src.components.root.repository import RootRepository
+from src.components.root.file_repository import RootFileRepository
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def root_file_repo() -> RootFileRepository:
+    return RootFileRepository()
+
+
+@pytest.fixture
+async def root(db_conn_clean: AsyncConnection) -> Root:
+    return await RootRepository().create(db_conn_clean, Root(uri=f"/test/path/{uuid4().hex}"))
+
+
+def _create_root_files(root_uri: str, count: int, start: int = 0, size: int = 1024) -> list[RootFile]:
+    """Helper to build RootFile models with distinct paths."""
+    now = datetime.now().replace(microsecond=0)
+    return [
+        RootFile(
+            root_uri=root_uri,
+            name=f"file_{i}.txt",
+            path=f"dir/file_{i}.txt",
+            extension=".txt",
+            mime_type="text/plain",
+            size=size,
+            atime=now,
+            mtime=now - timedelta(seconds=i),
+            ctime=now,
+        )
+        for i in range(start, start + count)
+    ]
+
+
+async def test_bulk_create_below_copy_threshold(db_conn_clean: AsyncConnection, root_file_repo: RootFileRepository, root: Root):
+    files = _create_root_files(root.uri, 3)
+
+    created = await root_file_repo.bulk_create(db_conn_clean, files)
+
+    assert len(created) == 3
+    assert all(isinstance(f, RootFile) for f in created)
+    assert {f.path for f in created} == {f.path for f in files}
+
+
+async def test_bulk_create_via_copy(db_conn_clean: AsyncConnection, root_file_repo: RootFileRepository, root: Root):
+    files = _create_root_files(root.uri, root_file_repo.copy_threshold)
+
+    created = await root_file_repo.bulk_create(db_conn_clean, files)
+
+    # RETURNING rows map back onto RootFile
+    assert len(created) == len(files)
+    assert all(isinstance(f, RootFile) for f in created)
+    by_path = {f.path: f for f in created}
+    for f in files:
+        returned = by_path[f.path]
+        assert returned.root_uri == root.uri
+        assert returned.name == f.name
+        assert returned.size == f.size
+        assert returned.mtime == f.mtime
+
+    stored = await root_file_repo.get_files_by_root(db_conn_clean, root.uri)
+    assert len(stored) == len(files)
+
+
+async def test_bulk_create_via_copy_twice_in_one_transaction(db_conn_clean: AsyncConnection, root_file_repo: RootFileRepository, root: Root):
+    batch_size = root_file_repo.copy_threshold
+    first = _create_root_files(root.uri, batch_size)
+    # Second batch overlaps the last half of the first one with a new size
+    second = _create_root_files(root.uri, batch_size, start=batch_size // 2, size=2048)
+
+    # The staging table is reused and must not re-apply the first batch
+    created_first = await root_file_repo.bulk_create(db_conn_clean, first)
+    created_second = await root_file_repo.bulk_create(db_conn_clean, second)
+
+    assert len(created_first) == batch_size
+    assert len(created_second) == batch_size
+    assert all(f.size == 2048 for f in created_second)
+
+    stored = {f.path: f for f in await root_file_repo.get_files_by_root(db_conn_clean, root.uri)}
+    assert len(stored) == batch_size + batch_size // 2
+    for f in first[:batch_size // 2]:
+        assert stored[f.path].size == 1024
+    # Conflicting rows were updated
+    for f in second:
+        assert stored[f.path].size == 2048
+
+
+async def test_delete_paths(db_conn_clean: AsyncConnection, root_file_repo: RootFileRepository, root: Root):
+    other_root = await RootRepository().create(db_conn_clean, Root(uri=f"/test/path/{uuid4().hex}"))
+    files = _create_root_files(root.uri, 5)
+    # Same paths under another root must survive
+    await root_file_repo.bulk_create(db_conn_clean, files + _create_root_files(other_root.uri, 5))
+
+    to_delete = [files[0].path, files[2].path, "dir/not_stored.txt"]
+    deleted = await root_file_repo.delete_paths(db_conn_clean, root.uri, to_delete)
+
+    assert deleted == 2
+    remaining = {f.path for f in await root_file_repo.get_files_by_root(db_conn_clean, root.uri)}
+    assert remaining == {files[1].path, files[3].path, files[4].path}
+    assert len(await root_file_repo.get_files_by_root(db_conn_clean, other_root.uri)) == 5
+
+
+async def test_delete_paths_empty(db_conn_clean: AsyncConnection, root_file_repo: RootFileRepository, root: Root):
+    await root_file_repo.bulk_create(db_conn_clean, _create_root_files(root.uri, 2))
+
+    deleted = await root_file_repo.delete_paths(db_conn_clean, root.uri, [])
+
+    assert deleted == 0
+    assert len(await root_file_repo.get_files_by_root(db_conn_clean, root.uri)) == 2
+
+
+async def test_stream_file_states(db_conn_clean: AsyncConnection, root_file_repo: RootFileRepository, root: Root):
+    batch_size = 10
+    files = _create_root_files(root.uri, batch_size * 2 + 5)
+    await root_file_repo.bulk_create(db_conn_clean, files)
+
+    states = [
+        state async for state in root_file_repo.stream_file_states(db_conn_clean, root.uri, batch_size=batch_size)
+    ]
+
+    assert sorted(states) == sorted((f.path, f.size, f.mtime, f.mime_type) for f in files)
@@ -77,6 +77,19 @@ async def test_get_root_by_uri_not_found(db_conn_clean: AsyncConnection, root_re
     assert fetched_root is None
 
 
+async def test_get_or_create_root(db_conn_clean: AsyncConnection, root_repo: RootRepository, sample_root_data: dict):
+    created_root = await root_repo.get_or_create(db_conn_clean, sample_root_data["uri"])
+
+    assert created_root is not None
+    assert created_root.uri == sample_root_data["uri"]
+    assert isinstance(created_root.created_at, datetime)
+
+    # A second call returns the existing row rather than failing on the PK
+    existing_root = await root_repo.get_or_create(db_conn_clean, sample_root_data["uri"])
+    assert existing_root.uri == created_root.uri
+    assert existing_root.created_at == created_root.created_at
+
+
 async def test_get_all_roots(db_conn_clean: AsyncConnection, root_repo: RootRepository, sample_root_data: dict):
     # Test data remains the same, just how we create/assert changes slightly
     root1_data = _create_root_data(sample_root_data, uri=f"file:///test/all/{uuid4().hex}")
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+from unittest.mock import AsyncMock
+
+from src.core.cache import RedisService
+from src.core.user_state import UserStateService
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def redis_hashes() -> dict:
+    """Backing store for the mocked Redis client: key -> {field: raw value}"""
+    return {}
+
+
+@pytest.fixture
+def redis_service(redis_hashes: dict) -> RedisService:
+    service = RedisService(redis_url="redis://localhost:6379/0")
+
+    async def hget(key, field):
+        return redis_hashes.get(key, {}).get(field)
+
+    async def hgetall(key):
+        return dict(redis_hashes.get(key, {}))
+
+    async def hset(key, field, value):
+        redis_hashes.setdefault(key, {})[field] = value
+
+    async def hdel(key, *fields):
+        for field in fields:
+            redis_hashes.get(key, {}).pop(field, None)
+
+    async def delete(key):
+        redis_hashes.pop(key, None)
+
+    client = AsyncMock()
+    client.hget.side_effect = hget
+    client.hgetall.side_effect = hgetall
+    client.hset.side_effect = hset
+    client.hdel.side_effect = hdel
+    client.delete.side_effect = delete
+    service.redis = client
+    return service
+
+
+@pytest.fixture
+def user_state(redis_service: RedisService) -> UserStateService:
+    return UserStateService(redis_service=redis_service)
+
+
+async def test_set_and_get(user_state: UserStateService, redis_hashes: dict):
+    await user_state.set('selected_roots', ['/a', '/b'])
+
+    assert await user_state.get('selected_roots') == ['/a', '/b']
+    # Each key is stored as its own JSON-encoded hash field
+    assert redis_hashes[UserStateService._REDIS_KEY] == {'selected_roots': json.dumps(['/a', '/b'])}
+
+
+async def test_get_missing_field(user_state: UserStateService):
+    assert await user_state.get('missing') is None
+    assert await user_state.get('missing', default=[]) == []
+
+
+async def test_get_falsy_value_is_not_replaced_by_default(user_state: UserStateService):
+    await user_state.set('count', 0)
+
+    assert await user_state.get('count', default=5) == 0
+
+
+async def test_get_all(user_state: UserStateService):
+    await user_state.set('selected_roots', ['/a'])
+    await user_state.set('theme', {'dark': True})
+
+    assert await user_state.get_all() == {'selected_roots': ['/a'], 'theme': {'dark': True}}
+
+
+async def test_get_all_empty(user_state: UserStateService):
+    assert await user_state.get_all() == {}
+
+
+async def test_delete(user_state: UserStateService):
+    await user_state.set('selected_roots', ['/a'])
+    await user_state.set('theme', 'dark')
+
+    await user_state.delete('selected_roots')
+
+    assert await user_state.get('selected_roots') is None
+    assert await user_state.get_all() == {'theme': 'dark'}
+
+
+async def test_clear(user_state: UserStateService, redis_hashes: dict):
+    await user_state.set('selected_roots', ['/a'])
+    await user_state.set('theme', 'dark')
+
+    await user_state.clear()
+
+    assert await user_state.get_all() == {}
+    assert UserStateService._REDIS_KEY not in redis_hashes
+
+
+async def test_redis_service_logs_and_swallows_client_errors(redis_service: RedisService):
+    redis_service.redis.hget.side_effect = ConnectionError("redis down")
+    redis_service.redis.hgetall.side_effect = ConnectionError("redis down")
+
+    assert await redis_service.hget('key', 'field') is None
+    assert await redis_service.hgetall('key') == {}